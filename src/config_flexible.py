@@ -65,6 +65,7 @@ class SecurityConfig:
     max_login_attempts: int = 5
     lockout_duration_minutes: int = 15
     require_email_verification: bool = False
+    bcrypt_rounds: int = 12
 
 
 @dataclass
@@ -146,6 +147,7 @@ class FlexibleConfig:
             lockout_duration_minutes=int(os.getenv("LOCKOUT_DURATION_MINUTES", "15")),
             require_email_verification=os.getenv("REQUIRE_EMAIL_VERIFICATION", "False").lower()
             == "true",
+            bcrypt_rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
         )
 
     def _load_api_config(self) -> APIConfig:
@@ -1,6 +1,9 @@
 import os
 import sys
+import hashlib
+import json
 import logging
+import mimetypes
 from datetime import datetime, timezone
 
 # DON'T CHANGE THIS !!!
@@ -11,7 +14,7 @@ import sentry_sdk
 from sentry_sdk.integrations.flask import FlaskIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, abort, jsonify, request
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit # Namespace is no longer used directly here
 
@@ -44,6 +47,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# "eventlet" only under gunicorn's eventlet worker, which monkey-patches before loading the app
+SOCKETIO_ASYNC_MODE = os.getenv("SOCKETIO_ASYNC_MODE", "threading")
+
+
+def load_static_cache(static_folder):
+    """Read the static bundle into memory keyed by relative path"""
+    cache = {}
+    for root, _dirs, files in os.walk(static_folder):
+        for filename in files:
+            full_path = os.path.join(root, filename)
+            rel_path = os.path.relpath(full_path, static_folder).replace(os.sep, "/")
+            with open(full_path, "rb") as f:
+                body = f.read()
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            cache[rel_path] = (body, mimetype, hashlib.sha1(body).hexdigest())
+    return cache
+
 
 def create_app(test_config=None):
     """Application factory pattern"""
@@ -116,14 +136,16 @@ def create_app(test_config=None):
         socketio_cors = list(set(socketio_cors))
     
     socketio = SocketIO(app, cors_allowed_origins=socketio_cors, 
-                       async_mode='threading', logger=True, engineio_logger=True)
+                       async_mode=SOCKETIO_ASYNC_MODE, logger=True, engineio_logger=True)
 
     # Initialize database
     db.init_app(app)
 
     # Initialize services
     auth_service = AuthenticationService(
-        secret_key=config.security.secret_key, token_expiry_hours=config.security.jwt_expiry_hours
+        secret_key=config.security.secret_key,
+        token_expiry_hours=config.security.jwt_expiry_hours,
+        bcrypt_rounds=config.security.bcrypt_rounds,
     )
 
     security_service = SecurityHardeningService(config.to_dict())
@@ -308,6 +330,9 @@ def create_app(test_config=None):
                         "type": "postgresql" if config.database.is_postgresql else "sqlite",
                     },
                     "services": {"enabled": enabled_services, "count": len(enabled_services)},
+                    "websocket": {
+                        "swarm_streaming_sessions": websocket_service.get_streaming_sessions_count(),
+                    },
                     "features": {
                         "user_registration": True,
                         "websocket_support": True,
@@ -339,43 +364,58 @@ def create_app(test_config=None):
         division_by_zero = 1 / 0  # This will trigger a Sentry error
         return "This should not be reached"
 
-    # Serve static files
+    # Serve static files from memory - the bundle is small and fixed for the process
+    static_cache = load_static_cache(app.static_folder)
+
+    def send_cached_static(path):
+        entry = static_cache.get(path)
+        if entry is None:
+            abort(404)
+        body, mimetype, etag = entry
+        response = Response(body, mimetype=mimetype)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request)
+
     @app.route("/")
     def serve_index():
         """Serve the main application"""
-        return send_from_directory(app.static_folder, "index.html")
+        return send_cached_static("index.html")
 
     @app.route("/<path:path>")
     def serve_static(path):
         """Serve static files"""
-        try:
-            return send_from_directory(app.static_folder, path)
-        except FileNotFoundError:
-            # For SPA routing, return index.html for unknown routes
-            return send_from_directory(app.static_folder, "index.html")
+        # Unknown paths keep getting the JSON 404 from handle_not_found
+        return send_cached_static(path)
+
+    # Configuration endpoint - public config is fixed for the process, so encode it once
+    enabled_services = config.get_enabled_services()
+    public_config_body = json.dumps(
+        {
+            "success": True,
+            "config": {
+                "features": {
+                    "user_registration": True,
+                    "websocket_support": True,
+                    "streaming_responses": True,
+                },
+                "services": {
+                    "enabled": enabled_services,
+                    "count": len(enabled_services),
+                },
+                "version": "2.0.0",
+                "environment": "production" if not config.debug else "development",
+            },
+        }
+    ).encode("utf-8")
+    public_config_etag = hashlib.sha1(public_config_body).hexdigest()
 
-    # Configuration endpoint
     @app.route("/api/config")
     def get_config_endpoint():
         """Get public configuration"""
-        return jsonify(
-            {
-                "success": True,
-                "config": {
-                    "features": {
-                        "user_registration": True,
-                        "websocket_support": True,
-                        "streaming_responses": True,
-                    },
-                    "services": {
-                        "enabled": config.get_enabled_services(),
-                        "count": len(config.get_enabled_services()),
-                    },
-                    "version": "2.0.0",
-                    "environment": "production" if not config.debug else "development",
-                },
-            }
-        )
+        response = Response(public_config_body, mimetype="application/json")
+        response.set_etag(public_config_etag)
+        return response.make_conditional(request)
 
     logger.info(f"Swarm Multi-Agent System v2.0 initialized")
     logger.info(f"Database: {'PostgreSQL' if config.database.is_postgresql else 'SQLite'}")
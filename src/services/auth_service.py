@@ -3,10 +3,11 @@ JWT Authentication Service - Secure authentication and authorization for Swarm M
 """
 
 import logging
+import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from functools import wraps
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import bcrypt
 import jwt
@@ -64,12 +65,13 @@ class AuthenticationService(BaseService):
     - Session management
     """
 
-    def __init__(self, secret_key: str, token_expiry_hours: int = 24):
+    def __init__(self, secret_key: str, token_expiry_hours: int = 24, bcrypt_rounds: int = 12):
         super().__init__("authentication")
         self.secret_key = secret_key
         self.token_expiry_hours = token_expiry_hours
+        self.bcrypt_rounds = bcrypt_rounds
         self.algorithm = "HS256"
-        self.revoked_tokens = set()  # In production, use Redis or database
+        self.revoked_tokens = set()  # Revoked jti values; in production, use Redis or database
 
         # Define default roles and permissions
         self.roles = {
@@ -123,12 +125,18 @@ class AuthenticationService(BaseService):
             ),
         }
 
+        # Role definitions are fixed after init, so permission lookups use precomputed sets
+        self._role_permissions = {
+            name: frozenset(role.permissions) for name, role in self.roles.items()
+        }
+        self._permissions_cache: Dict[frozenset, List[str]] = {}
+
         logger.info("Authentication service initialized with JWT support")
 
     @handle_service_errors
     def hash_password(self, password: str) -> str:
         """Hash password using bcrypt"""
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.bcrypt_rounds)
         hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
         return hashed.decode("utf-8")
 
@@ -140,6 +148,12 @@ class AuthenticationService(BaseService):
     @handle_service_errors
     def generate_token(self, user: AuthUser) -> str:
         """Generate JWT token for authenticated user"""
+        token, _ = self.generate_token_with_payload(user)
+        return token
+
+    @handle_service_errors
+    def generate_token_with_payload(self, user: AuthUser) -> Tuple[str, TokenPayload]:
+        """Generate JWT token and return it with its payload, without decoding it again"""
         now = datetime.now(timezone.utc)
         exp = now + timedelta(hours=self.token_expiry_hours)
 
@@ -149,24 +163,34 @@ class AuthenticationService(BaseService):
             "roles": user.roles,
             "exp": exp,
             "iat": now,
-            "jti": f"{user.id}_{int(now.timestamp())}",  # Unique token ID
+            "jti": uuid.uuid4().hex,  # Unique token ID, used as the revocation key
         }
 
         token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
         logger.info(f"Generated JWT token for user {user.username}")
-        return token
+        return token, TokenPayload(**payload)
 
     @handle_service_errors
     def validate_token(self, token: str) -> Optional[TokenPayload]:
         """Validate JWT token and return payload"""
+        return self._decode_token(token)
+
+    @handle_service_errors
+    def validate_tokens(self, tokens: List[str]) -> List[Optional[TokenPayload]]:
+        """Validate several JWT tokens in one call, in order"""
+        decode = self._decode_token
+        return [decode(token) for token in tokens]
+
+    def _decode_token(self, token: str) -> Optional[TokenPayload]:
+        """Decode a single token, returning None if revoked, expired or invalid"""
         try:
+            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+
             # Check if token is revoked
-            if token in self.revoked_tokens:
+            if payload["jti"] in self.revoked_tokens:
                 logger.warning("Attempted use of revoked token")
                 return None
 
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-
             return TokenPayload(
                 user_id=payload["user_id"],
                 username=payload["username"],
@@ -188,7 +212,7 @@ class AuthenticationService(BaseService):
         """Revoke a JWT token"""
         payload = self.validate_token(token)
         if payload:
-            self.revoked_tokens.add(token)
+            self.revoked_tokens.add(payload.jti)
             logger.info(f"Revoked token for user {payload.username}")
             return True
         return False
@@ -212,19 +236,23 @@ class AuthenticationService(BaseService):
 
     def check_permission(self, user_roles: List[str], required_permission: str) -> bool:
         """Check if user has required permission"""
+        role_permissions = self._role_permissions
         for role_name in user_roles:
-            role = self.roles.get(role_name)
-            if role and required_permission in role.permissions:
+            permissions = role_permissions.get(role_name)
+            if permissions and required_permission in permissions:
                 return True
         return False
 
     def get_user_permissions(self, user_roles: List[str]) -> List[str]:
         """Get all permissions for user roles"""
-        permissions = set()
-        for role_name in user_roles:
-            role = self.roles.get(role_name)
-            if role:
-                permissions.update(role.permissions)
+        key = frozenset(user_roles)
+        permissions = self._permissions_cache.get(key)
+        if permissions is None:
+            combined = set()
+            for role_name in key:
+                combined.update(self._role_permissions.get(role_name, ()))
+            permissions = self._permissions_cache[key] = list(combined)
+        # Callers get their own list so the cached one cannot be modified
         return list(permissions)
 
 
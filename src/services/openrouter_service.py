@@ -257,11 +257,12 @@ class OpenRouterService(BaseService):
 
             response.raise_for_status()
 
-            # Process streaming response
+            # Process streaming response. This loop runs once per token, so debug
+            # logging uses lazy %-formatting to avoid repr-ing every chunk when disabled.
             for line in response.iter_lines():
                 if line:
                     line = line.decode("utf-8")
-                    logger.debug(f"Received line: {line}")
+                    logger.debug("Received line: %s", line)
 
                     # Skip empty lines and comments
                     if not line.strip() or line.startswith("#"):
@@ -278,7 +279,7 @@ class OpenRouterService(BaseService):
 
                         try:
                             chunk = json.loads(data_str)
-                            logger.debug(f"Parsed chunk: {chunk}")
+                            logger.debug("Parsed chunk: %s", chunk)
                             yield chunk
                         except json.JSONDecodeError as e:
                             logger.warning(f"Failed to parse streaming chunk: {e}, data: {data_str}")
@@ -328,15 +329,19 @@ class OpenRouterService(BaseService):
 
         # If streaming is requested, use streaming method
         if stream:
-            full_content = ""
+            # Collect parts and join once; repeated str += copies the whole response per token
+            parts: List[str] = []
             for chunk in self.stream_chat_completion(messages, model):
-                if chunk and "choices" in chunk and len(chunk["choices"]) > 0:
-                    delta = chunk["choices"][0].get("delta", {})
-                    content = delta.get("content", "")
-                    if content:
-                        full_content += content
+                # Fast path: well-formed deltas are the common case, so skip the
+                # membership checks and {} defaults and only pay on malformed chunks
+                try:
+                    content = chunk["choices"][0]["delta"]["content"]
+                except (KeyError, IndexError, TypeError):
+                    continue
+                if content:
+                    parts.append(content)
 
-            return ChatResponse(content=full_content, model=model)
+            return ChatResponse(content="".join(parts), model=model)
 
         # Convert to ChatMessage objects for regular completion
         chat_messages = []
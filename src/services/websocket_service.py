@@ -2,13 +2,18 @@
 WebSocket Service for Real-Time Agent Coordination with Enhanced MCP Integration
 """
 
+import itertools
 import json
 import logging
+import os
 import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from flask import current_app, request
 from flask_socketio import Namespace, emit, join_room, leave_room
@@ -18,6 +23,23 @@ from src.services.base_service import BaseService
 
 logger = logging.getLogger(__name__)
 
+# Hot emit paths share one ISO timestamp per 10ms window instead of formatting per frame
+_TIMESTAMP_RESOLUTION = 0.01
+_cached_timestamp = (-1, "")
+
+
+def _utc_now_iso() -> str:
+    """Get current UTC time as an ISO string, memoized at 10ms resolution"""
+    global _cached_timestamp
+    now = time.time()
+    # Compare buckets, not elapsed time, so a backwards clock step still refreshes
+    bucket = int(now / _TIMESTAMP_RESOLUTION)
+    cached_bucket, iso = _cached_timestamp
+    if bucket != cached_bucket:
+        iso = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        _cached_timestamp = (bucket, iso)
+    return iso
+
 
 class AgentStatus(Enum):
     """Agent status enumeration"""
@@ -30,6 +52,18 @@ class AgentStatus(Enum):
 
 class WebSocketMessage:
     """WebSocket message structure"""
+
+    __slots__ = (
+        "message_id",
+        "message_type",
+        "content",
+        "sender_id",
+        "recipient_id",
+        "room_id",
+        "metadata",
+        "timestamp",
+    )
+
     def __init__(self, message_id: str, message_type: str, content: str, 
                  sender_id: str, recipient_id: str = None, room_id: str = None,
                  metadata: Dict[str, Any] = None):
@@ -53,7 +87,26 @@ class WebSocketService(BaseService):
         self.connected_clients = {}
         self.agent_states = {}
         self.active_rooms = {}
-        self.streaming_sessions = {}
+        # Insertion-ordered so the oldest session is evicted first once the cap is hit
+        self.streaming_sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_streaming_sessions = int(os.getenv("SWARM_MAX_STREAMING_SESSIONS", "1024"))
+        # Reverse index so disconnect cleanup only touches that client's sessions
+        self._client_sessions: Dict[str, Set[str]] = {}
+        # Sessions are added by socket handlers and released by stream workers
+        self._sessions_lock = threading.RLock()
+        # Built lazily on first message; reused so agent system prompts are built once
+        self._agent_service = None
+        self._mcp_status_cache = None
+        self._mcp_status_timestamp = 0
+        self.mcp_status_cache_duration = 5  # seconds
+        # Bounded worker pool for streaming responses instead of a thread per message
+        self._stream_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("SWARM_STREAM_WORKERS", "32")),
+            thread_name_prefix="swarm-stream",
+        )
+        # Pool workers are not daemon threads and the interpreter joins them before
+        # atexit handlers run, so hook the same threading exit step the pool uses
+        threading._register_atexit(self.shutdown)
         
         # Verify MCP filesystem service
         if self.mcp_filesystem_service:
@@ -61,12 +114,105 @@ class WebSocketService(BaseService):
             if health.get("status") == "healthy":
                 logger.info("✅ MCP Filesystem service connected and healthy")
             else:
-                logger.error(f"❌ MCP Filesystem service unhealthy: {health}")
+                logger.error("❌ MCP Filesystem service unhealthy: %s", health)
         else:
             logger.warning("⚠️ MCP Filesystem service not provided")
 
+    def register_streaming_session(self, session_id: str, session: Dict[str, Any]):
+        """Track a new streaming session and index it by owning client"""
+        evicted = []
+        with self._sessions_lock:
+            while self.streaming_sessions and len(self.streaming_sessions) >= self.max_streaming_sessions:
+                evicted.append(self._evict_oldest_streaming_session())
+            self.streaming_sessions[session_id] = session
+            self._client_sessions.setdefault(session["client_id"], set()).add(session_id)
+
+        # Tell clients whose replies were cut short, outside the lock
+        for evicted_id, evicted_session in evicted:
+            self._emit_to_client(
+                evicted_session["client_id"],
+                "response_stream_error",
+                {
+                    "session_id": evicted_id,
+                    "error": "Streaming session evicted: server at capacity",
+                    "timestamp": _utc_now_iso(),
+                },
+            )
+
+    def _release_streaming_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Stop tracking a session and drop it from its client's index"""
+        with self._sessions_lock:
+            session = self.streaming_sessions.pop(session_id, None)
+            if session is None:
+                return None
+            session["active"] = False
+            self._unindex_streaming_session(session["client_id"], session_id)
+            return session
+
+    def _unindex_streaming_session(self, client_id: str, session_id: str):
+        """Remove a session from its client's index (caller holds the lock)"""
+        client_sessions = self._client_sessions.get(client_id)
+        if client_sessions is not None:
+            client_sessions.discard(session_id)
+            if not client_sessions:
+                del self._client_sessions[client_id]
+
+    def _evict_oldest_streaming_session(self):
+        """Cut the oldest session to make room; the caller tells its client (caller holds the lock)"""
+        # Finished sessions are released right away, so every tracked session is still streaming
+        session_id, session = self.streaming_sessions.popitem(last=False)
+        session["active"] = False
+        self._unindex_streaming_session(session["client_id"], session_id)
+        logger.warning(
+            "Evicted active streaming session %s (limit %s)", session_id, self.max_streaming_sessions
+        )
+        return session_id, session
+
+    def get_streaming_sessions_count(self) -> int:
+        """Get number of tracked streaming sessions"""
+        return len(self.streaming_sessions)
+
+    def _cleanup_streaming_sessions(self, client_id: str) -> int:
+        """Stop and drop all streaming sessions owned by a disconnected client"""
+        with self._sessions_lock:
+            session_ids = list(self._client_sessions.get(client_id, ()))
+            for session_id in session_ids:
+                self._release_streaming_session(session_id)
+        return len(session_ids)
+
+    def _get_agent_service(self):
+        """Get the shared agent service, creating it on first use (requires app context)"""
+        if self._agent_service is None:
+            # Import here to avoid circular imports
+            from ..services.openrouter_service import OpenRouterService
+            from ..services.agent_service import AgentService
+            from ..services.supermemory_service import SupermemoryService
+
+            openrouter_service = OpenRouterService()
+            supermemory_service = SupermemoryService() if hasattr(current_app, 'config_manager') else None
+
+            # CRITICAL FIX: Ensure MCP filesystem service is passed correctly
+            if not self.mcp_filesystem_service:
+                logger.error("❌ MCP Filesystem service not available for agent")
+                # Try to get from app context as fallback
+                self.mcp_filesystem_service = getattr(current_app, 'mcp_filesystem_service', None)
+
+            # Create agent service with MCP filesystem
+            self._agent_service = AgentService(
+                openrouter_service=openrouter_service,
+                supermemory_service=supermemory_service,
+                mcp_filesystem_service=self.mcp_filesystem_service
+            )
+        return self._agent_service
+
+    def _emit_to_client(self, client_id: str, event: str, payload: Dict[str, Any]):
+        """Emit a streaming event to a single client on the swarm namespace"""
+        # Server-level emit: runs on pool workers/greenlets with no Socket.IO request context
+        self.app.socketio.emit(event, payload, to=client_id, namespace="/swarm")
+
     def _start_streaming_response(self, session_id: str, message: WebSocketMessage, model: str):
         """Start streaming response from agent with proper Flask context"""
+        client_id = None
         try:
             session = self.streaming_sessions.get(session_id)
             if not session or not session["active"]:
@@ -76,46 +222,27 @@ class WebSocketService(BaseService):
             agent_id = session["agent_id"]
 
             # Emit stream start
-            emit(
+            self._emit_to_client(
+                client_id,
                 "response_stream_start",
                 {
                     "session_id": session_id,
                     "agent_id": agent_id,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "timestamp": _utc_now_iso(),
                 },
-                room=client_id,
             )
 
             # CRITICAL FIX: Use Flask app context for threading
             with self.app.app_context():
-                # Import here to avoid circular imports
-                from ..services.openrouter_service import OpenRouterService
-                from ..services.agent_service import AgentService
-                from ..services.supermemory_service import SupermemoryService
-
                 # Get services with proper error handling
                 try:
-                    openrouter_service = OpenRouterService()
-                    supermemory_service = SupermemoryService() if hasattr(current_app, 'config_manager') else None
-                    
-                    # CRITICAL FIX: Ensure MCP filesystem service is passed correctly
-                    if not self.mcp_filesystem_service:
-                        logger.error("❌ MCP Filesystem service not available for agent")
-                        # Try to get from app context as fallback
-                        self.mcp_filesystem_service = getattr(current_app, 'mcp_filesystem_service', None)
-                    
-                    # Create agent service with MCP filesystem
-                    agent_service = AgentService(
-                        openrouter_service=openrouter_service,
-                        supermemory_service=supermemory_service,
-                        mcp_filesystem_service=self.mcp_filesystem_service
-                    )
+                    agent_service = self._get_agent_service()
 
                     # Log MCP filesystem status
                     if agent_service.mcp_filesystem:
-                        logger.info(f"✅ Agent {agent_id} has MCP filesystem access")
+                        logger.info("✅ Agent %s has MCP filesystem access", agent_id)
                     else:
-                        logger.error(f"❌ Agent {agent_id} missing MCP filesystem access")
+                        logger.error("❌ Agent %s missing MCP filesystem access", agent_id)
 
                     # Use agent service for proper MCP filesystem integration
                     response = agent_service.chat_with_agent(
@@ -136,41 +263,43 @@ class WebSocketService(BaseService):
                                 
                             chunk = content[i:i + chunk_size]
                             
-                            emit(
+                            # Chunk frames carry only per-chunk fields; agent_id and
+                            # timestamp are sent once on stream start/complete
+                            self._emit_to_client(
+                                client_id,
                                 "response_stream_chunk",
                                 {
                                     "session_id": session_id,
-                                    "agent_id": agent_id,
                                     "chunk": chunk,
                                     "chunk_index": i // chunk_size,
                                     "is_final": i + chunk_size >= len(content),
-                                    "timestamp": datetime.now(timezone.utc).isoformat(),
                                 },
-                                room=client_id,
-                                namespace="/swarm",
                             )
                             
                             # Small delay for streaming effect
-                            import time
                             time.sleep(0.1)
-                    
+
+                    # Evicted or disconnected mid-stream: the reply was cut, so don't report it complete
+                    if not session.get("active", False):
+                        return
+
                     # Emit stream complete
-                    emit(
+                    self._emit_to_client(
+                        client_id,
                         "response_stream_complete",
                         {
                             "session_id": session_id,
                             "agent_id": agent_id,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
+                            "timestamp": _utc_now_iso(),
                         },
-                        room=client_id,
-                        namespace="/swarm",
                     )
                     
                 except Exception as service_error:
-                    logger.error(f"❌ Service error in streaming: {service_error}")
+                    logger.error("❌ Service error in streaming: %s", service_error)
                     
                     # Send fallback error response
-                    emit(
+                    self._emit_to_client(
+                        client_id,
                         "response_stream_chunk",
                         {
                             "session_id": session_id,
@@ -179,49 +308,63 @@ class WebSocketService(BaseService):
                             "chunk_index": 0,
                             "is_final": True,
                             "error": True,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
+                            "timestamp": _utc_now_iso(),
                         },
-                        room=client_id,
-                        namespace="/swarm",
                     )
 
         except Exception as e:
-            logger.error(f"❌ Critical error in streaming response: {e}")
+            logger.error("❌ Critical error in streaming response: %s", e)
             
-            # Emit error to client
-            emit(
-                "response_stream_error",
-                {
-                    "session_id": session_id,
-                    "error": str(e),
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
-                room=client_id,
-                namespace="/swarm",
-            )
+            # Emit error to client (if we got far enough to know who it is)
+            if client_id:
+                self._emit_to_client(
+                    client_id,
+                    "response_stream_error",
+                    {
+                        "session_id": session_id,
+                        "error": str(e),
+                        "timestamp": _utc_now_iso(),
+                    },
+                )
         finally:
-            # Clean up session
-            if session_id in self.streaming_sessions:
-                self.streaming_sessions[session_id]["active"] = False
+            # Finished sessions leave the table so it only holds live streams
+            self._release_streaming_session(session_id)
+
+    def shutdown(self):
+        """Stop accepting streaming work, drop queued streams and cut running ones short"""
+        self._stream_pool.shutdown(wait=False, cancel_futures=True)
+        with self._sessions_lock:
+            for session in self.streaming_sessions.values():
+                session["active"] = False
 
     def get_mcp_status(self) -> Dict[str, Any]:
-        """Get MCP filesystem service status"""
+        """Get MCP filesystem service status with short-lived caching"""
         if not self.mcp_filesystem_service:
             return {
                 "status": "disconnected",
                 "error": "MCP filesystem service not initialized"
             }
+
+        # Check cache - every connect and status broadcast reads this
+        current_time = time.time()
+        if (
+            self._mcp_status_cache is not None
+            and current_time - self._mcp_status_timestamp < self.mcp_status_cache_duration
+        ):
+            return self._mcp_status_cache
         
         try:
             health = self.mcp_filesystem_service.health_check()
             stats = self.mcp_filesystem_service.get_workspace_stats()
             
-            return {
+            self._mcp_status_cache = {
                 "status": health.get("status", "unknown"),
                 "health": health,
                 "stats": stats,
                 "service_name": "mcp_filesystem"
             }
+            self._mcp_status_timestamp = current_time
+            return self._mcp_status_cache
         except Exception as e:
             return {
                 "status": "error",
@@ -236,13 +379,20 @@ class SwarmWebSocketNamespace(Namespace):
         super().__init__("/swarm")
         self.websocket_service = websocket_service
         self.connected_clients = {}
+        # Internal message IDs never leave the server, so a counter is enough
+        self._msg_counter = itertools.count()
         self.agent_states = {
-            "email_agent": {"status": AgentStatus.IDLE, "connected_users": []},
-            "calendar_agent": {"status": AgentStatus.IDLE, "connected_users": []},
-            "code_agent": {"status": AgentStatus.IDLE, "connected_users": []},
-            "debug_agent": {"status": AgentStatus.IDLE, "connected_users": []},
-            "general_agent": {"status": AgentStatus.IDLE, "connected_users": []},
+            "email_agent": {"status": AgentStatus.IDLE, "connected_users": set()},
+            "calendar_agent": {"status": AgentStatus.IDLE, "connected_users": set()},
+            "code_agent": {"status": AgentStatus.IDLE, "connected_users": set()},
+            "debug_agent": {"status": AgentStatus.IDLE, "connected_users": set()},
+            "general_agent": {"status": AgentStatus.IDLE, "connected_users": set()},
         }
+        # Guards agent status bookkeeping touched from handlers and stream workers
+        self._status_lock = threading.Lock()
+        # Latest pending status delta per agent, flushed once per burst window
+        self._pending_status: Dict[str, Dict[str, Any]] = {}
+        self.status_flush_interval = float(os.getenv("SWARM_STATUS_FLUSH_INTERVAL", "0.05"))
 
     def on_connect(self):
         """Handle client connection with MCP status"""
@@ -251,8 +401,8 @@ class SwarmWebSocketNamespace(Namespace):
         
         self.connected_clients[client_id] = {
             "user_id": user_id,
-            "connected_at": datetime.now(timezone.utc).isoformat(),
-            "agent_subscriptions": [],
+            "connected_at": _utc_now_iso(),
+            "agent_subscriptions": set(),
         }
         
         # Get MCP status
@@ -261,21 +411,23 @@ class SwarmWebSocketNamespace(Namespace):
         emit("connection_established", {
             "client_id": client_id,
             "user_id": user_id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _utc_now_iso(),
             "mcp_status": mcp_status,
+            "agent_states": self._agent_states_snapshot(),
         })
         
-        logger.info(f"✅ Client connected: {user_id} (MCP: {mcp_status.get('status', 'unknown')})")
+        logger.info("✅ Client connected: %s (MCP: %s)", user_id, mcp_status.get("status", "unknown"))
 
     def on_disconnect(self):
         """Handle client disconnection"""
         client_id = request.sid
+        self.websocket_service._cleanup_streaming_sessions(client_id)
         if client_id in self.connected_clients:
             user_id = self.connected_clients[client_id].get("user_id", "unknown")
             del self.connected_clients[client_id]
-            logger.info(f"Client disconnected: {user_id} ({client_id})")
+            logger.info("Client disconnected: %s (%s)", user_id, client_id)
         else:
-            logger.info(f"Client disconnected: {client_id} (already removed or not found)")
+            logger.info("Client disconnected: %s (already removed or not found)", client_id)
 
     def on_user_message(self, data): # Renamed from on_send_message
         """Enhanced message handling with MCP filesystem support, receives messages from users."""
@@ -290,7 +442,7 @@ class SwarmWebSocketNamespace(Namespace):
             
             # Create message
             message = WebSocketMessage(
-                message_id=str(uuid.uuid4()),
+                message_id=f"m{next(self._msg_counter):x}",
                 message_type="USER_MESSAGE",
                 content=data.get("content", ""),
                 sender_id=user_id,
@@ -317,7 +469,7 @@ class SwarmWebSocketNamespace(Namespace):
                 self._broadcast_to_agents(message)
 
         except Exception as e:
-            logger.error(f"❌ Send message error: {e}")
+            logger.error("❌ Send message error: %s", e)
             emit("error", {"message": "Failed to send message", "error": str(e)})
 
     def _send_to_agent_with_streaming(self, message: WebSocketMessage, model: str, client_id: str):
@@ -328,48 +480,107 @@ class SwarmWebSocketNamespace(Namespace):
                 emit("error", {"message": f"Agent {agent_id} not found"}, room=client_id)
                 return
 
-            # Update agent status
+            # Count the stream before going THINKING so a stream finishing meanwhile can't
+            # broadcast IDLE over it; the agent goes back to idle when its last stream ends
+            with self._status_lock:
+                agent_state = self.agent_states[agent_id]
+                agent_state["active_streams"] = agent_state.get("active_streams", 0) + 1
             self.update_agent_status(agent_id, AgentStatus.THINKING, "Processing user message")
 
             # Create streaming session
             session_id = str(uuid.uuid4())
-            self.websocket_service.streaming_sessions[session_id] = {
+            self.websocket_service.register_streaming_session(session_id, {
                 "client_id": client_id,
                 "agent_id": agent_id,
                 "message_id": message.message_id,
                 "model": model,
                 "original_message": message.content,  # Store original message for fallback
-                "started_at": datetime.now(timezone.utc).isoformat(),
+                "started_at": _utc_now_iso(),
                 "active": True,
-            }
+            })
 
-            # Start streaming response in background thread with Flask context
-            thread = threading.Thread(
-                target=self.websocket_service._start_streaming_response,
-                args=(session_id, message, model)
-            )
-            thread.daemon = True
-            thread.start()
+            # Start streaming response on the shared worker pool with Flask context
+            try:
+                self.websocket_service._stream_pool.submit(
+                    self._stream_and_reset_status, agent_id, session_id, message, model
+                )
+            except RuntimeError:
+                # Pool already shut down: undo the bookkeeping so nothing leaks
+                self.websocket_service._release_streaming_session(session_id)
+                self._finish_agent_stream(agent_id)
+                raise
 
         except Exception as e:
-            logger.error(f"❌ Send to agent with streaming error: {e}")
+            logger.error("❌ Send to agent with streaming error: %s", e)
             emit("error", {"message": "Failed to send message", "error": str(e)})
 
-    def update_agent_status(self, agent_id: str, status: AgentStatus, message: str = ""):
-        """Update agent status and broadcast to connected clients"""
-        if agent_id in self.agent_states:
-            self.agent_states[agent_id]["status"] = status
-            
-            # Include MCP status for agents
-            mcp_status = self.websocket_service.get_mcp_status()
-            
-            emit("agent_status_update", {
+    def _stream_and_reset_status(self, agent_id: str, session_id: str, message: WebSocketMessage, model: str):
+        """Run a streaming response, then return the agent to idle once no streams remain"""
+        try:
+            self.websocket_service._start_streaming_response(session_id, message, model)
+        finally:
+            self._finish_agent_stream(agent_id)
+
+    def _finish_agent_stream(self, agent_id: str):
+        """Drop one stream from the agent's count, returning it to idle when none remain"""
+        with self._status_lock:
+            agent_state = self.agent_states[agent_id]
+            agent_state["active_streams"] = max(agent_state.get("active_streams", 1) - 1, 0)
+        # Re-checked under the lock, since another stream may start before this applies
+        self.update_agent_status(agent_id, AgentStatus.IDLE, only_if_no_streams=True)
+
+    def update_agent_status(self, agent_id: str, status: AgentStatus, message: str = "",
+                            only_if_no_streams: bool = False):
+        """Update agent status and broadcast only the fields that changed"""
+        agent_state = self.agent_states.get(agent_id)
+        if agent_state is None:
+            return
+
+        # Include MCP status for agents
+        mcp_status = self.websocket_service.get_mcp_status()
+
+        current = {
+            "status": status.value,
+            "message": message,
+            "mcp_status": mcp_status.get("status", "unknown"),
+        }
+        with self._status_lock:
+            if only_if_no_streams and agent_state.get("active_streams", 0):
+                return
+            agent_state["status"] = status
+            last_broadcast = agent_state.setdefault("last_broadcast", {})
+            changed = {key: value for key, value in current.items() if last_broadcast.get(key) != value}
+            if not changed:
+                return
+            last_broadcast.update(changed)
+
+            # Clients get the full snapshot on connect, so updates carry only the delta.
+            # Bursts collapse into the newest value per field until the flush runs.
+            schedule_flush = not self._pending_status
+            self._pending_status.setdefault(agent_id, {}).update(changed)
+
+        if schedule_flush:
+            self.socketio.start_background_task(self._flush_status_updates)
+
+    def _flush_status_updates(self):
+        """Wait one flush window, then broadcast the latest pending delta per agent and exit"""
+        self.socketio.sleep(self.status_flush_interval)
+        with self._status_lock:
+            pending, self._pending_status = self._pending_status, {}
+        timestamp = _utc_now_iso()
+        for agent_id, changed in pending.items():
+            self.socketio.emit("agent_status_update", {
                 "agent_id": agent_id,
-                "status": status.value,
-                "message": message,
-                "mcp_status": mcp_status.get("status", "unknown"),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }, broadcast=True)
+                **changed,
+                "timestamp": timestamp,
+            }, namespace="/swarm")
+
+    def _agent_states_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Full agent state for newly connected clients"""
+        return {
+            agent_id: {**state.get("last_broadcast", {}), "status": state["status"].value}
+            for agent_id, state in self.agent_states.items()
+        }
 
     def on_get_mcp_status(self):
         """Handle MCP status request"""
@@ -20,9 +20,8 @@ def create_error_response(error: SwarmException, status_code: int = 500) -> Dict
     }
 
 
-def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
-    """Create a standardized success response (alias for create_success_response)"""
-    return create_success_response(data, message)
+# Alias kept for the routes that import the short name
+success_response = create_success_response
 
 
 def error_response(
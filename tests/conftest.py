@@ -3,28 +3,32 @@ Test configuration and fixtures for Swarm Multi-Agent System
 """
 
 import os
-import tempfile
 from datetime import datetime, timezone
 from unittest.mock import Mock, patch
 
 import pytest
+from sqlalchemy.pool import StaticPool
 
 from src.config_flexible import FlexibleConfig
 from src.main import create_app
 from src.models.user import User, db
 from src.services.auth_service import AuthenticationService
 
+# Minimum bcrypt cost - tests check the hash round trip, not its strength
+TEST_BCRYPT_ROUNDS = 4
+
 
 @pytest.fixture(scope="session")
 def app():
     """Create application for testing"""
-    # Create temporary database
-    db_fd, db_path = tempfile.mkstemp()
-
-    # Test configuration
+    # In-memory database; StaticPool keeps every session on the one connection that holds it
     test_config = {
         "TESTING": True,
-        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_ENGINE_OPTIONS": {
+            "connect_args": {"check_same_thread": False},
+            "poolclass": StaticPool,
+        },
         "SQLALCHEMY_TRACK_MODIFICATIONS": False,
         "SECRET_KEY": "test-secret-key-for-testing-only",
         "WTF_CSRF_ENABLED": False,
@@ -33,9 +37,10 @@ def app():
     # Set test environment variables
     os.environ.update(
         {
-            "DATABASE_URL": f"sqlite:///{db_path}",
+            "DATABASE_URL": "sqlite:///:memory:",
             "SECRET_KEY": "test-secret-key-for-testing-only",
             "DEBUG": "False",
+            "BCRYPT_ROUNDS": str(TEST_BCRYPT_ROUNDS),
             "OPENROUTER_API_KEY": "test-openrouter-key",
             "SUPERMEMORY_API_KEY": "test-supermemory-key",
             "MAILGUN_API_KEY": "test-mailgun-key",
@@ -50,13 +55,24 @@ def app():
         yield app
         db.drop_all()
 
-    os.close(db_fd)
-    os.unlink(db_path)
+
+@pytest.fixture(autouse=True)
+def clean_database(request):
+    """Empty every table after each test that used the app, keeping the session-wide schema"""
+    yield
+    if "app" not in request.fixturenames:
+        return
+    app = request.getfixturevalue("app")
+    with app.app_context():
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client(app):
-    """Create test client"""
+    """Create test client, shared by the tests in a module"""
     return app.test_client()
 
 
@@ -69,10 +85,12 @@ def runner(app):
 @pytest.fixture
 def auth_service():
     """Create authentication service for testing"""
-    return AuthenticationService(secret_key="test-secret-key", token_expiry_hours=1)
+    return AuthenticationService(
+        secret_key="test-secret-key", token_expiry_hours=1, bcrypt_rounds=TEST_BCRYPT_ROUNDS
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_user_data():
     """Test user data"""
     return {
@@ -84,7 +102,7 @@ def test_user_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_admin_data():
     """Test admin user data"""
     return {
@@ -95,15 +113,28 @@ def test_admin_data():
     }
 
 
+@pytest.fixture(scope="session")
+def test_user_password_hash(test_user_data):
+    """bcrypt hash of the test user password, computed once per session"""
+    hasher = AuthenticationService(secret_key="test-secret-key", bcrypt_rounds=TEST_BCRYPT_ROUNDS)
+    return hasher.hash_password(test_user_data["password"])
+
+
+@pytest.fixture(scope="session")
+def test_admin_password_hash(test_admin_data):
+    """bcrypt hash of the test admin password, computed once per session"""
+    hasher = AuthenticationService(secret_key="test-secret-key", bcrypt_rounds=TEST_BCRYPT_ROUNDS)
+    return hasher.hash_password(test_admin_data["password"])
+
+
 @pytest.fixture
-def create_test_user(app, auth_service, test_user_data):
+def create_test_user(app, test_user_data, test_user_password_hash):
     """Create a test user in the database"""
     with app.app_context():
-        password_hash = auth_service.hash_password(test_user_data["password"])
         user = User(
             username=test_user_data["username"],
             email=test_user_data["email"],
-            password_hash=password_hash,
+            password_hash=test_user_password_hash,
             roles="user",
             is_active=True,
             created_at=datetime.now(timezone.utc),
@@ -116,14 +147,13 @@ def create_test_user(app, auth_service, test_user_data):
 
 
 @pytest.fixture
-def create_test_admin(app, auth_service, test_admin_data):
+def create_test_admin(app, test_admin_data, test_admin_password_hash):
     """Create a test admin user in the database"""
     with app.app_context():
-        password_hash = auth_service.hash_password(test_admin_data["password"])
         user = User(
             username=test_admin_data["username"],
             email=test_admin_data["email"],
-            password_hash=password_hash,
+            password_hash=test_admin_password_hash,
             roles=test_admin_data["roles"],
             is_active=True,
             created_at=datetime.now(timezone.utc),
@@ -215,7 +245,7 @@ def mock_mcp_service():
     return mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config():
     """Test configuration object"""
     return FlexibleConfig()
@@ -256,7 +286,7 @@ class TestHelpers:
         assert data["success"] is True
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def helpers():
     """Test helpers fixture"""
     return TestHelpers
@@ -9,6 +9,16 @@ import pytest
 
 from src.models.user import User, db
 
+# Request bodies that never vary between runs are encoded once at import
+NEW_USER_DATA = {
+    "username": "newuser",
+    "email": "newuser@example.com",
+    "password": "password123",
+    "confirm_password": "password123",
+}
+NEW_USER_BODY = json.dumps(NEW_USER_DATA)
+EMPTY_BODY = json.dumps({})
+
 
 @pytest.mark.integration
 @pytest.mark.auth
@@ -17,15 +27,10 @@ class TestAuthenticationRoutes:
 
     def test_user_registration(self, client):
         """Test user registration endpoint"""
-        user_data = {
-            "username": "newuser",
-            "email": "newuser@example.com",
-            "password": "password123",
-            "confirm_password": "password123",
-        }
+        user_data = NEW_USER_DATA
 
         response = client.post(
-            "/api/auth/register", data=json.dumps(user_data), content_type="application/json"
+            "/api/auth/register", data=NEW_USER_BODY, content_type="application/json"
         )
 
         assert response.status_code == 201
@@ -36,32 +41,32 @@ class TestAuthenticationRoutes:
         assert data["user"]["email"] == user_data["email"]
         assert "password" not in data["user"]
 
-    def test_registration_validation(self, client):
+    @pytest.mark.parametrize(
+        "body",
+        [
+            EMPTY_BODY,  # missing fields
+            json.dumps(
+                {
+                    "username": "testuser",
+                    "email": "test@example.com",
+                    "password": "password123",
+                    "confirm_password": "different123",
+                }
+            ),  # password mismatch
+            json.dumps(
+                {
+                    "username": "testuser",
+                    "email": "test@example.com",
+                    "password": "short",
+                    "confirm_password": "short",
+                }
+            ),  # short password
+        ],
+        ids=["missing_fields", "password_mismatch", "short_password"],
+    )
+    def test_registration_validation(self, client, body):
         """Test registration input validation"""
-        # Test missing fields
-        response = client.post(
-            "/api/auth/register", data=json.dumps({}), content_type="application/json"
-        )
-        assert response.status_code == 400
-
-        # Test password mismatch
-        user_data = {
-            "username": "testuser",
-            "email": "test@example.com",
-            "password": "password123",
-            "confirm_password": "different123",
-        }
-        response = client.post(
-            "/api/auth/register", data=json.dumps(user_data), content_type="application/json"
-        )
-        assert response.status_code == 400
-
-        # Test short password
-        user_data["confirm_password"] = "short"
-        user_data["password"] = "short"
-        response = client.post(
-            "/api/auth/register", data=json.dumps(user_data), content_type="application/json"
-        )
+        response = client.post("/api/auth/register", data=body, content_type="application/json")
         assert response.status_code == 400
 
     def test_duplicate_registration(self, client, create_test_user):
@@ -127,7 +132,7 @@ class TestAuthenticationRoutes:
         """Test login input validation"""
         # Test missing credentials
         response = client.post(
-            "/api/auth/login", data=json.dumps({}), content_type="application/json"
+            "/api/auth/login", data=EMPTY_BODY, content_type="application/json"
         )
         assert response.status_code == 400
 
@@ -138,15 +143,14 @@ class TestAuthenticationRoutes:
         )
         assert response.status_code == 401
 
-    def test_login_inactive_user(self, app, client, auth_service, test_user_data):
+    def test_login_inactive_user(self, app, client, test_user_data, test_user_password_hash):
         """Test login with inactive user account"""
         with app.app_context():
             # Create inactive user
-            password_hash = auth_service.hash_password(test_user_data["password"])
             user = User(
                 username="inactive_user",
                 email="inactive@example.com",
-                password_hash=password_hash,
+                password_hash=test_user_password_hash,
                 roles="user",
                 is_active=False,  # Inactive user
                 created_at=datetime.now(timezone.utc),
@@ -208,30 +212,31 @@ class TestAuthenticationRoutes:
         data = response.get_json()
         assert data["success"] is True
 
-    def test_change_password_validation(self, client, auth_headers):
+    @pytest.mark.parametrize(
+        "body",
+        [
+            json.dumps(
+                {
+                    "current_password": "wrongpassword",
+                    "new_password": "newpassword123",
+                    "confirm_password": "newpassword123",
+                }
+            ),
+            json.dumps(
+                {
+                    "current_password": "testpassword123",
+                    "new_password": "newpassword123",
+                    "confirm_password": "different123",
+                }
+            ),
+        ],
+        ids=["wrong_current_password", "password_mismatch"],
+    )
+    def test_change_password_validation(self, client, auth_headers, body):
         """Test password change validation"""
-        # Test wrong current password
-        password_data = {
-            "current_password": "wrongpassword",
-            "new_password": "newpassword123",
-            "confirm_password": "newpassword123",
-        }
-
-        response = client.post(
-            "/api/auth/change-password",
-            data=json.dumps(password_data),
-            content_type="application/json",
-            headers=auth_headers,
-        )
-        assert response.status_code == 400
-
-        # Test password mismatch
-        password_data["current_password"] = "testpassword123"
-        password_data["confirm_password"] = "different123"
-
         response = client.post(
             "/api/auth/change-password",
-            data=json.dumps(password_data),
+            data=body,
             content_type="application/json",
             headers=auth_headers,
         )
@@ -311,23 +316,21 @@ class TestAdminRoutes:
         assert data["success"] is True
         assert data["user"]["is_active"] is False
 
-    def test_admin_operations_unauthorized(self, client, auth_headers, create_test_user):
+    @pytest.mark.parametrize(
+        "operation,body",
+        [
+            ("roles", json.dumps({"roles": ["admin"]})),
+            ("status", json.dumps({"is_active": False})),
+        ],
+        ids=["roles", "status"],
+    )
+    def test_admin_operations_unauthorized(
+        self, client, auth_headers, create_test_user, operation, body
+    ):
         """Test admin operations without admin privileges"""
-        # Test role update
-        role_data = {"roles": ["admin"]}
         response = client.put(
-            f"/api/auth/users/{create_test_user.id}/roles",
-            data=json.dumps(role_data),
-            content_type="application/json",
-            headers=auth_headers,
-        )
-        assert response.status_code == 403
-
-        # Test status update
-        status_data = {"is_active": False}
-        response = client.put(
-            f"/api/auth/users/{create_test_user.id}/status",
-            data=json.dumps(status_data),
+            f"/api/auth/users/{create_test_user.id}/{operation}",
+            data=body,
             content_type="application/json",
             headers=auth_headers,
         )
@@ -0,0 +1,69 @@
+"""
+Integration tests for static file and public config routes
+"""
+
+import pytest
+
+
+@pytest.mark.integration
+@pytest.mark.routes
+class TestStaticRoutes:
+    """Integration tests for the in-memory static bundle"""
+
+    def test_index_served_with_etag(self, client):
+        """Test the main application page is served with an ETag"""
+        response = client.get("/")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/html"
+        assert response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    def test_index_not_modified(self, client):
+        """Test a matching If-None-Match gets 304 without a body"""
+        etag = client.get("/").headers["ETag"]
+
+        response = client.get("/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_static_file_served(self, client):
+        """Test files under the static folder are served by path"""
+        response = client.get("/tailwind.css")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/css"
+
+    def test_unknown_path_not_found(self, client):
+        """Test unknown paths get the JSON 404 instead of the application page"""
+        response = client.get("/no/such/file.js")
+
+        assert response.status_code == 404
+        data = response.get_json()
+        assert data["success"] is False
+        assert data["error_code"] == "NOT_FOUND"
+
+
+@pytest.mark.integration
+@pytest.mark.routes
+class TestConfigRoute:
+    """Integration tests for the public config endpoint"""
+
+    def test_config_served_with_etag(self, client):
+        """Test public config is returned with an ETag"""
+        response = client.get("/api/config")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"]
+        data = response.get_json()
+        assert data["success"] is True
+        assert data["config"]["version"] == "2.0.0"
+
+    def test_config_not_modified(self, client):
+        """Test a matching If-None-Match gets 304"""
+        etag = client.get("/api/config").headers["ETag"]
+
+        response = client.get("/api/config", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
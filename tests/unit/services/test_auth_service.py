@@ -2,25 +2,46 @@
 Unit tests for Authentication Service
 """
 
-from datetime import datetime, timedelta, timezone
-from unittest.mock import patch
+import re
+from dataclasses import replace
+from datetime import datetime, timezone
 
 import pytest
 
 from src.services.auth_service import AuthenticationService, AuthUser, TokenPayload
 
+# Fixed account creation time; no test depends on the actual instant
+CREATED_AT = datetime.now(timezone.utc)
+
+# Three base64url segments: header, payload, signature
+JWT_PATTERN = re.compile(r"[A-Za-z0-9_-]{20,}\.[A-Za-z0-9_-]{20,}\.[A-Za-z0-9_-]{20,}")
+
+
+@pytest.fixture(scope="module")
+def sample_user():
+    """Standard test user shared by the token tests in this module"""
+    return AuthUser(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        roles=["user"],
+        is_active=True,
+        created_at=CREATED_AT,
+    )
+
 
 class TestAuthenticationService:
     """Test cases for AuthenticationService"""
 
-    def test_password_hashing(self, auth_service):
+    def test_password_hashing(self, auth_service, test_user_data, test_user_password_hash):
         """Test password hashing and verification"""
-        password = "testpassword123"
+        password = test_user_data["password"]
 
-        # Hash password
-        hashed = auth_service.hash_password(password)
+        # Hash computed once per session by the test_user_password_hash fixture
+        hashed = test_user_password_hash
         assert hashed != password
         assert len(hashed) > 50  # bcrypt hashes are long
+        assert hashed.startswith("$2b$04$")  # tests hash at the minimum bcrypt cost
 
         # Verify correct password
         assert auth_service.verify_password(password, hashed) is True
@@ -28,42 +49,23 @@ class TestAuthenticationService:
         # Verify incorrect password
         assert auth_service.verify_password("wrongpassword", hashed) is False
 
-    def test_token_generation(self, auth_service):
+    def test_token_generation(self, auth_service, sample_user):
         """Test JWT token generation"""
-        user = AuthUser(
-            id=1,
-            username="testuser",
-            email="test@example.com",
-            roles=["user"],
-            is_active=True,
-            created_at=datetime.now(timezone.utc),
-        )
-
-        token = auth_service.generate_token(user)
+        token = auth_service.generate_token(sample_user)
         assert isinstance(token, str)
-        assert len(token) > 100  # JWT tokens are long
-        assert token.count(".") == 2  # JWT has 3 parts separated by dots
+        assert JWT_PATTERN.fullmatch(token)
 
-    def test_token_validation(self, auth_service):
+    def test_token_validation(self, auth_service, sample_user):
         """Test JWT token validation"""
-        user = AuthUser(
-            id=1,
-            username="testuser",
-            email="test@example.com",
-            roles=["user"],
-            is_active=True,
-            created_at=datetime.now(timezone.utc),
-        )
-
         # Generate and validate token
-        token = auth_service.generate_token(user)
+        token = auth_service.generate_token(sample_user)
         payload = auth_service.validate_token(token)
 
         assert payload is not None
         assert isinstance(payload, TokenPayload)
-        assert payload.user_id == user.id
-        assert payload.username == user.username
-        assert payload.roles == user.roles
+        assert payload.user_id == sample_user.id
+        assert payload.username == sample_user.username
+        assert payload.roles == sample_user.roles
 
     def test_invalid_token_validation(self, auth_service):
         """Test validation of invalid tokens"""
@@ -76,40 +78,22 @@ class TestAuthenticationService:
         payload = auth_service.validate_token("")
         assert payload is None
 
-    def test_expired_token_validation(self, auth_service):
+    def test_expired_token_validation(self, auth_service, sample_user):
         """Test validation of expired tokens"""
         # Create service with very short expiry
         short_auth_service = AuthenticationService(
             secret_key="test-key", token_expiry_hours=0  # Immediate expiry
         )
 
-        user = AuthUser(
-            id=1,
-            username="testuser",
-            email="test@example.com",
-            roles=["user"],
-            is_active=True,
-            created_at=datetime.now(timezone.utc),
-        )
-
-        token = short_auth_service.generate_token(user)
+        token = short_auth_service.generate_token(sample_user)
 
         # Token should be immediately expired
         payload = short_auth_service.validate_token(token)
         assert payload is None
 
-    def test_token_revocation(self, auth_service):
+    def test_token_revocation(self, auth_service, sample_user):
         """Test token revocation"""
-        user = AuthUser(
-            id=1,
-            username="testuser",
-            email="test@example.com",
-            roles=["user"],
-            is_active=True,
-            created_at=datetime.now(timezone.utc),
-        )
-
-        token = auth_service.generate_token(user)
+        token = auth_service.generate_token(sample_user)
 
         # Token should be valid initially
         payload = auth_service.validate_token(token)
@@ -163,26 +147,23 @@ class TestAuthenticationService:
         """Test that all required roles are defined"""
         required_roles = ["admin", "user", "readonly", "api"]
 
-        for role in required_roles:
-            assert role in auth_service.roles
-            role_obj = auth_service.roles[role]
-            assert role_obj.name == role
-            assert isinstance(role_obj.permissions, list)
-            assert len(role_obj.permissions) > 0
-            assert isinstance(role_obj.description, str)
+        roles = {role: auth_service.roles.get(role) for role in required_roles}
+        assert None not in roles.values(), roles
 
-    def test_token_refresh(self, auth_service):
-        """Test token refresh functionality"""
-        user = AuthUser(
-            id=1,
-            username="testuser",
-            email="test@example.com",
-            roles=["user"],
-            is_active=True,
-            created_at=datetime.now(timezone.utc),
-        )
+        # One snapshot per role; a failing role shows up in the dict diff
+        snapshot = {
+            role: (
+                role_obj.name,
+                isinstance(role_obj.permissions, list) and len(role_obj.permissions) > 0,
+                isinstance(role_obj.description, str),
+            )
+            for role, role_obj in roles.items()
+        }
+        assert snapshot == {role: (role, True, True) for role in required_roles}
 
-        token = auth_service.generate_token(user)
+    def test_token_refresh(self, auth_service, sample_user):
+        """Test token refresh functionality"""
+        token = auth_service.generate_token(sample_user)
 
         # Test refresh (should return same token if not close to expiry)
         refreshed_token = auth_service.refresh_token(token)
@@ -197,26 +178,12 @@ class TestAuthenticationService:
 class TestAuthenticationIntegration:
     """Integration tests for authentication system"""
 
-    def test_full_authentication_flow(self, auth_service):
+    def test_full_authentication_flow(self, auth_service, sample_user):
         """Test complete authentication flow"""
-        # Create user
-        user = AuthUser(
-            id=1,
-            username="testuser",
-            email="test@example.com",
-            roles=["user"],
-            is_active=True,
-            created_at=datetime.now(timezone.utc),
-        )
-
-        # Generate token
-        token = auth_service.generate_token(user)
+        # Generate token; the payload comes back without a decode round trip
+        token, payload = auth_service.generate_token_with_payload(sample_user)
         assert token is not None
-
-        # Validate token
-        payload = auth_service.validate_token(token)
-        assert payload is not None
-        assert payload.user_id == user.id
+        assert payload.user_id == sample_user.id
 
         # Check permissions
         assert auth_service.check_permission(payload.roles, "agent.read") is True
@@ -231,30 +198,28 @@ class TestAuthenticationIntegration:
 
     def test_multiple_user_tokens(self, auth_service):
         """Test handling multiple user tokens"""
+        base_user = AuthUser(
+            id=0,
+            username="",
+            email="",
+            roles=["user"],
+            is_active=True,
+            created_at=CREATED_AT,
+        )
         users = [
-            AuthUser(
-                id=i,
-                username=f"user{i}",
-                email=f"user{i}@example.com",
-                roles=["user"],
-                is_active=True,
-                created_at=datetime.now(timezone.utc),
-            )
+            replace(base_user, id=i, username=f"user{i}", email=f"user{i}@example.com")
             for i in range(1, 4)
         ]
 
         tokens = [auth_service.generate_token(user) for user in users]
 
         # All tokens should be valid
-        for i, token in enumerate(tokens):
-            payload = auth_service.validate_token(token)
-            assert payload is not None
-            assert payload.user_id == users[i].id
+        payloads = auth_service.validate_tokens(tokens)
+        assert [payload.user_id for payload in payloads] == [user.id for user in users]
 
         # Revoke one token
         auth_service.revoke_token(tokens[1])
 
         # Check token validity
-        assert auth_service.validate_token(tokens[0]) is not None
-        assert auth_service.validate_token(tokens[1]) is None
-        assert auth_service.validate_token(tokens[2]) is not None
+        payloads = auth_service.validate_tokens(tokens)
+        assert [payload is not None for payload in payloads] == [True, False, True]
@@ -0,0 +1,84 @@
+"""
+Unit tests for WebSocket Service streaming session tracking
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.services.websocket_service import WebSocketService
+
+
+def make_session(client_id):
+    """Minimal streaming session as registered by the swarm namespace"""
+    return {"client_id": client_id, "agent_id": "general_agent", "active": True}
+
+
+@pytest.fixture
+def websocket_service():
+    """WebSocket service with a mock app, capped at two streaming sessions"""
+    service = WebSocketService(Mock())
+    service.max_streaming_sessions = 2
+    yield service
+    service.shutdown()
+
+
+class TestStreamingSessions:
+    """Test cases for the streaming session table"""
+
+    def test_register_indexes_by_client(self, websocket_service):
+        """Test sessions are tracked and indexed by owning client"""
+        websocket_service.register_streaming_session("s1", make_session("c1"))
+        websocket_service.register_streaming_session("s2", make_session("c2"))
+
+        assert websocket_service.get_streaming_sessions_count() == 2
+        assert websocket_service._client_sessions == {"c1": {"s1"}, "c2": {"s2"}}
+        websocket_service.app.socketio.emit.assert_not_called()
+
+    def test_cap_evicts_oldest_and_notifies_client(self, websocket_service):
+        """Test registering at the cap cuts the oldest session and tells its client"""
+        first = make_session("c1")
+        websocket_service.register_streaming_session("s1", first)
+        websocket_service.register_streaming_session("s2", make_session("c2"))
+        websocket_service.register_streaming_session("s3", make_session("c3"))
+
+        assert list(websocket_service.streaming_sessions) == ["s2", "s3"]
+        assert first["active"] is False
+        assert websocket_service._client_sessions == {"c2": {"s2"}, "c3": {"s3"}}
+
+        websocket_service.app.socketio.emit.assert_called_once()
+        args, kwargs = websocket_service.app.socketio.emit.call_args
+        assert args[0] == "response_stream_error"
+        assert args[1]["session_id"] == "s1"
+        assert kwargs == {"to": "c1", "namespace": "/swarm"}
+
+    def test_release_frees_a_slot(self, websocket_service):
+        """Test a finished session leaves the table so the next one evicts nothing"""
+        websocket_service.register_streaming_session("s1", make_session("c1"))
+        websocket_service.register_streaming_session("s2", make_session("c1"))
+
+        session = websocket_service._release_streaming_session("s1")
+        assert session["active"] is False
+        assert websocket_service._release_streaming_session("s1") is None
+
+        websocket_service.register_streaming_session("s3", make_session("c1"))
+        assert list(websocket_service.streaming_sessions) == ["s2", "s3"]
+        assert websocket_service._client_sessions == {"c1": {"s2", "s3"}}
+        websocket_service.app.socketio.emit.assert_not_called()
+
+    def test_disconnect_cleanup_only_touches_that_client(self, websocket_service):
+        """Test disconnect cleanup stops and drops only the client's own sessions"""
+        websocket_service.max_streaming_sessions = 10
+        mine = [make_session("c1"), make_session("c1")]
+        other = make_session("c2")
+        websocket_service.register_streaming_session("s1", mine[0])
+        websocket_service.register_streaming_session("s2", other)
+        websocket_service.register_streaming_session("s3", mine[1])
+
+        assert websocket_service._cleanup_streaming_sessions("c1") == 2
+        assert list(websocket_service.streaming_sessions) == ["s2"]
+        assert websocket_service._client_sessions == {"c2": {"s2"}}
+        assert [session["active"] for session in mine] == [False, False]
+        assert other["active"] is True
+
+        assert websocket_service._cleanup_streaming_sessions("c1") == 0